@@ -7,6 +7,7 @@ to add reliability features like ACK/NACK, retry, and deduplication.
 
 import asyncio
 import logging
+import random
 from typing import Any, ClassVar
 
 import anyio
@@ -47,8 +48,6 @@ class MockMCPSession:
         print(f"🔧 Executing tool: {tool_name} (attempt #{self.call_count})")
 
         # Simulate random failures
-        import random
-
         if random.random() < self.failure_rate:
             raise Exception(f"Simulated network error for {tool_name}")
 
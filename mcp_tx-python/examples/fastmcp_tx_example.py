@@ -5,6 +5,7 @@ to MCP tools using decorators, similar to FastMCP but for client-side reliabilit
 """
 
 import asyncio
+import random
 from datetime import datetime
 
 from mcp_tx import FastMCPTx, MCPTxConfig, RetryPolicy
@@ -37,8 +38,6 @@ async def main():
             if name == "unreliable_api":
                 # Sometimes fail to demonstrate retry
                 # NOTE: Using random for demo only - use secrets module for production randomness
-                import random
-
                 if random.random() < 0.3:  # 30% failure rate (demo only)
                     raise Exception("Simulated network error")
                 return {"result": {"status": "success", "data": f"API result for {arguments}"}}
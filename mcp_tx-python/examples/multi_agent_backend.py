@@ -77,7 +77,7 @@ class LocalExecutionSession:
         if not tool_def:
             raise MCPTxError(f"Tool '{tool_name}' not found.", "TOOL_NOT_FOUND", False)
         logger.info(f"Executing tool '{tool_name}' locally with params: {arguments}")
-        return await tool_def["func"](**arguments)
+        return await tool_def.dispatcher(**arguments)
 
 
 # --- FastMCPTx Application Setup ---
@@ -15,6 +15,7 @@ Environment Variables Required:
 import json
 import os
 import random
+import re
 from datetime import datetime
 from typing import Any
 
@@ -22,6 +23,70 @@ import aiohttp
 from dotenv import load_dotenv
 from openai import AsyncOpenAI
 
+JSON_ARRAY_RE = re.compile(r"\[.*\]", re.DOTALL)
+
+# Prompt templates are built once at import time and filled with %-formatting per call
+ANALYSIS_PROMPT = """
+Analyze the following content and provide a structured analysis:
+
+Content: %s...
+
+Please provide:
+1. Key Insights (3-5 bullet points)
+2. Credibility Assessment (1-10 score with reasoning)
+3. Relevance Score (1-10 with explanation)
+4. Summary (2-3 sentences)
+5. Main Claims (list the 2-3 most important claims)
+
+Format as markdown with clear sections.
+"""
+
+FACT_CHECK_PROMPT = """
+Please fact-check the following claim using logical analysis:
+
+Claim: %s
+
+Available sources: %d sources provided
+
+Provide:
+1. Verification Status: VERIFIED / DISPUTED / UNVERIFIED
+2. Confidence Score (1-10)
+3. Supporting Evidence (what supports this claim)
+4. Contradicting Evidence (what contradicts this claim, if any)
+5. Recommendation for the user
+
+Be conservative in your assessment and explain your reasoning.
+Format as markdown.
+"""
+
+REPORT_PROMPT = """
+Generate a comprehensive research report based on the following ACTUAL research data:
+
+Research Query: %(query)s
+
+ACTUAL SOURCES FOUND:
+%(sources)s
+
+ACTUAL CONTENT ANALYSES:
+%(analyses)s
+
+ACTUAL FACT CHECK RESULTS:
+%(fact_checks)s
+
+Please create a professional research report with SPECIFIC conclusions based on the actual data above:
+
+1. **Executive Summary** - Summarize the key findings from the actual research
+2. **Key Findings** - List 3-5 specific insights from the actual analyses
+3. **Source Quality Assessment** - Evaluate the credibility of the sources found
+4. **Fact-Check Summary** - Summarize verification results
+5. **Practical Conclusions** - What can we conclude about "%(query)s" based on this research?
+6. **Actionable Recommendations** - Specific next steps based on findings
+7. **Research Limitations** - What wasn't covered and needs further investigation
+
+IMPORTANT: Base all conclusions on the ACTUAL data provided above. Be specific and actionable.
+Use markdown formatting. Make it professional and business-ready.
+"""
+
 
 class RealAIService:
     """Real AI service implementation with actual API integrations."""
@@ -185,10 +250,8 @@ class RealAIService:
                 # Try to parse JSON from the response
                 if content:
                     try:
-                        import re
-
                         # Extract JSON array from response
-                        json_match = re.search(r"\[.*\]", content, re.DOTALL)
+                        json_match = JSON_ARRAY_RE.search(content)
                         if json_match:
                             results = json.loads(json_match.group())
                             # Add source and ensure proper format
@@ -254,20 +317,7 @@ class RealAIService:
             return self._fallback_analyze_content(content)
 
         try:
-            prompt = f"""
-            Analyze the following content and provide a structured analysis:
-
-            Content: {content[:2000]}...
-
-            Please provide:
-            1. Key Insights (3-5 bullet points)
-            2. Credibility Assessment (1-10 score with reasoning)
-            3. Relevance Score (1-10 with explanation)
-            4. Summary (2-3 sentences)
-            5. Main Claims (list the 2-3 most important claims)
-
-            Format as markdown with clear sections.
-            """
+            prompt = ANALYSIS_PROMPT % content[:2000]
 
             response = await self.openai_client.chat.completions.create(
                 model="gpt-3.5-turbo", messages=[{"role": "user", "content": prompt}], max_tokens=600, temperature=0.3
@@ -332,23 +382,7 @@ class RealAIService:
             return self._fallback_fact_check(claim, sources)
 
         try:
-            prompt = f"""
-            Please fact-check the following claim using logical analysis:
-
-            Claim: {claim[:500]}
-
-            Available sources: {len(sources)} sources provided
-
-            Provide:
-            1. Verification Status: VERIFIED / DISPUTED / UNVERIFIED
-            2. Confidence Score (1-10)
-            3. Supporting Evidence (what supports this claim)
-            4. Contradicting Evidence (what contradicts this claim, if any)
-            5. Recommendation for the user
-
-            Be conservative in your assessment and explain your reasoning.
-            Format as markdown.
-            """
+            prompt = FACT_CHECK_PROMPT % (claim[:500], len(sources))
 
             response = await self.openai_client.chat.completions.create(
                 model="gpt-3.5-turbo", messages=[{"role": "user", "content": prompt}], max_tokens=500, temperature=0.2
@@ -429,33 +463,14 @@ class RealAIService:
                 if isinstance(fact_check, dict) and "verification" in fact_check:
                     fact_check_results.append(fact_check["verification"][:150] + "...")
 
-            prompt = f"""
-            Generate a comprehensive research report based on the following ACTUAL research data:
-
-            Research Query: {query}
-
-            ACTUAL SOURCES FOUND:
-            {chr(10).join([f"- {title}" for title in source_titles])}
-
-            ACTUAL CONTENT ANALYSES:
-            {chr(10).join([f"Analysis {i + 1}: {summary}" for i, summary in enumerate(analysis_summaries)])}
-
-            ACTUAL FACT CHECK RESULTS:
-            {chr(10).join([f"Fact Check {i + 1}: {result}" for i, result in enumerate(fact_check_results)])}
-
-            Please create a professional research report with SPECIFIC conclusions based on the actual data above:
-
-            1. **Executive Summary** - Summarize the key findings from the actual research
-            2. **Key Findings** - List 3-5 specific insights from the actual analyses
-            3. **Source Quality Assessment** - Evaluate the credibility of the sources found
-            4. **Fact-Check Summary** - Summarize verification results
-            5. **Practical Conclusions** - What can we conclude about "{query}" based on this research?
-            6. **Actionable Recommendations** - Specific next steps based on findings
-            7. **Research Limitations** - What wasn't covered and needs further investigation
-
-            IMPORTANT: Base all conclusions on the ACTUAL data provided above. Be specific and actionable.
-            Use markdown formatting. Make it professional and business-ready.
-            """
+            prompt = REPORT_PROMPT % {
+                "query": query,
+                "sources": "\n".join("- " + title for title in source_titles),
+                "analyses": "\n".join(f"Analysis {i + 1}: {summary}" for i, summary in enumerate(analysis_summaries)),
+                "fact_checks": "\n".join(
+                    f"Fact Check {i + 1}: {result}" for i, result in enumerate(fact_check_results)
+                ),
+            }
 
             response = await self.openai_client.chat.completions.create(
                 model="gpt-3.5-turbo", messages=[{"role": "user", "content": prompt}], max_tokens=1200, temperature=0.4
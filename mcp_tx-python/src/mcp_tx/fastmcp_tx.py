@@ -6,10 +6,11 @@ to easily add MCP-Tx reliability features (retry, idempotency, ACK/NACK) to thei
 
 from __future__ import annotations
 
-import copy
+import functools
 import inspect
 import logging
 from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
 from typing import Any, TypeVar
 
 import anyio
@@ -25,11 +26,38 @@ SyncFunction = Callable[..., Any]
 AsyncFunction = Callable[..., Awaitable[Any]]
 
 
+def _run_in_thread(func: SyncFunction) -> AsyncFunction:
+    """Wrap a sync tool so that awaiting it runs the function in a worker thread."""
+
+    @functools.wraps(func)
+    async def dispatcher(*args: Any, **kwargs: Any) -> Any:
+        return await anyio.to_thread.run_sync(functools.partial(func, *args, **kwargs))
+
+    return dispatcher
+
+
+@dataclass(frozen=True, slots=True)
+class ToolEntry:
+    """Configuration of a registered tool.
+
+    ``dispatcher`` is an awaitable entry point chosen at registration: the function itself
+    for async tools, or a worker-thread wrapper for sync tools.
+    """
+
+    func: Callable[..., Any]
+    retry_policy: RetryPolicy | None
+    idempotency_key_generator: Callable[[dict[str, Any]], str] | None
+    timeout_ms: int | None
+    description: str | None
+    is_async: bool
+    dispatcher: AsyncFunction
+
+
 class ToolRegistry:
     """Registry for managing registered tools."""
 
     def __init__(self, max_tools: int = 1000) -> None:
-        self._tools: dict[str, dict[str, Any]] = {}
+        self._tools: dict[str, ToolEntry] = {}
         self._max_tools = max_tools
 
     def register_tool(
@@ -48,54 +76,53 @@ class ToolRegistry:
         if name in self._tools:
             raise ValueError(f"Tool '{name}' already registered")
 
-        self._tools[name] = {
-            "func": func,
-            "retry_policy": retry_policy,
-            "idempotency_key_generator": idempotency_key_generator,
-            "timeout_ms": timeout_ms,
-            "description": description or func.__doc__,
-            "is_async": inspect.iscoroutinefunction(func),
-        }
+        is_async = inspect.iscoroutinefunction(func)
+        self._tools[name] = ToolEntry(
+            func=func,
+            retry_policy=retry_policy,
+            idempotency_key_generator=idempotency_key_generator,
+            timeout_ms=timeout_ms,
+            description=description or func.__doc__,
+            is_async=is_async,
+            dispatcher=func if is_async else _run_in_thread(func),
+        )
         logger.debug(f"Registered tool: {name}")
 
-    def get_tool(self, name: str) -> dict[str, Any] | None:
+    def get_tool(self, name: str) -> ToolEntry | None:
         """Get tool configuration by name.
 
-        Returns a deep copy to prevent mutation of cached tool configurations.
+        Entries are frozen, so the registered configuration is returned without copying.
         """
-        tool = self._tools.get(name)
-        return copy.deepcopy(tool) if tool is not None else None
+        return self._tools.get(name)
 
     def list_tools(self) -> list[str]:
         """List all registered tool names."""
         return list(self._tools.keys())
 
+    def _tool_info(self, name: str, tool: ToolEntry) -> dict[str, Any]:
+        """Build the metadata for a registered tool.
+
+        Callers get a new, JSON-serializable dict they may modify freely.
+        """
+        return {
+            "name": name,
+            "description": tool.description,
+            "is_async": tool.is_async,
+            "has_retry_policy": tool.retry_policy is not None,
+            "timeout_ms": tool.timeout_ms,
+        }
+
     def get_tool_info(self, name: str) -> dict[str, Any] | None:
         """Get tool metadata for introspection."""
         tool = self._tools.get(name)
         if not tool:
             return None
 
-        return {
-            "name": name,
-            "description": tool["description"],
-            "is_async": tool["is_async"],
-            "has_retry_policy": tool["retry_policy"] is not None,
-            "timeout_ms": tool["timeout_ms"],
-        }
+        return self._tool_info(name, tool)
 
     def get_all_tools_info(self) -> dict[str, dict[str, Any]]:
         """Get information about all registered tools efficiently."""
-        return {
-            name: {
-                "name": name,
-                "description": tool["description"],
-                "is_async": tool["is_async"],
-                "has_retry_policy": tool["retry_policy"] is not None,
-                "timeout_ms": tool["timeout_ms"],
-            }
-            for name, tool in self._tools.items()
-        }
+        return {name: self._tool_info(name, tool) for name, tool in self._tools.items()}
 
 
 class FastMCPTx:
@@ -118,28 +145,28 @@ class FastMCPTx:
         """
         self.name = name
         self._mcp_session = mcp_session
+        # Set only once initialization has completed, so it doubles as the initialized flag
         self._mcp_tx_session: MCPTxSession | None = None
         self._config = config or MCPTxConfig()
         self._registry = ToolRegistry(max_tools=max_tools)
-        self._initialized = False
         self._init_lock = anyio.Lock()
 
         logger.info(f"Created FastMCPTx app: {name}")
 
     async def initialize(self) -> None:
         """Initialize the MCP-Tx session."""
-        # Fast path: check if already initialized without acquiring lock
-        if self._initialized:
+        # Fast path: already initialized, no lock needed
+        if self._mcp_tx_session is not None:
             return
 
-        # Double-check pattern: verify state after acquiring lock
+        # The lock only serializes the first, concurrent initializations
         async with self._init_lock:
-            if self._initialized:
+            if self._mcp_tx_session is not None:
                 return
 
-            self._mcp_tx_session = MCPTxSession(self._mcp_session, self._config)
-            await self._mcp_tx_session.initialize()
-            self._initialized = True
+            mcp_tx_session = MCPTxSession(self._mcp_session, self._config)
+            await mcp_tx_session.initialize()
+            self._mcp_tx_session = mcp_tx_session
             logger.info(f"Initialized FastMCPTx app: {self.name}")
 
     async def __aenter__(self) -> FastMCPTx:
@@ -234,7 +261,7 @@ class FastMCPTx:
             RuntimeError: If FastMCPTx is not initialized
         """
         # Input validation
-        if not isinstance(name, str) or not name.strip():
+        if not isinstance(name, str) or not name or name.isspace():
             raise ValueError("Tool name must be a non-empty string")
 
         if arguments is None:
@@ -245,7 +272,7 @@ class FastMCPTx:
         if idempotency_key is not None and not isinstance(idempotency_key, str):
             raise ValueError("Idempotency key must be a string or None")
 
-        if not self._initialized or not self._mcp_tx_session:
+        if self._mcp_tx_session is None:
             raise RuntimeError("FastMCPTx not initialized. Use 'async with app:' or call 'await app.initialize()'")
 
         tool_config = self._registry.get_tool(name)
@@ -253,9 +280,9 @@ class FastMCPTx:
             raise ValueError(f"Tool '{name}' not registered. Available tools: {self._registry.list_tools()}")
 
         # Generate idempotency key if needed
-        if idempotency_key is None and tool_config["idempotency_key_generator"]:
+        if idempotency_key is None and tool_config.idempotency_key_generator:
             try:
-                idempotency_key = tool_config["idempotency_key_generator"](arguments)
+                idempotency_key = tool_config.idempotency_key_generator(arguments)
             except Exception as e:
                 logger.warning(f"Failed to generate idempotency key for tool '{name}': {e}")
 
@@ -263,8 +290,8 @@ class FastMCPTx:
         return await self._mcp_tx_session.call_tool(
             name=name,
             arguments=arguments,
-            retry_policy=tool_config["retry_policy"],
-            timeout_ms=tool_config["timeout_ms"],
+            retry_policy=tool_config.retry_policy,
+            timeout_ms=tool_config.timeout_ms,
             idempotency_key=idempotency_key,
         )
 
@@ -282,4 +309,4 @@ class FastMCPTx:
 
 
 # Convenience exports
-__all__ = ["FastMCPTx", "ToolRegistry"]
+__all__ = ["FastMCPTx", "ToolEntry", "ToolRegistry"]
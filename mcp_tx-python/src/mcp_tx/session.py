@@ -4,10 +4,18 @@ MCP-Tx Session - Wraps MCP sessions with reliability features.
 
 from __future__ import annotations
 
+import dataclasses
+import functools
+import hashlib
 import logging
 import random
 import re
-from datetime import datetime, timedelta
+import socket
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from datetime import datetime
+from types import MappingProxyType
 from typing import Any, Protocol
 
 import anyio
@@ -27,8 +35,64 @@ from .types import (
 
 logger = logging.getLogger(__name__)
 
+TOOLS_CALL_METHOD = "tools/call"
+
+# Advertised to servers as capabilities.experimental.mcp_tx
+MCP_TX_CAPABILITIES: Mapping[str, Any] = MappingProxyType(
+    {"version": "0.1.0", "features": ("ack", "retry", "idempotency", "transactions")}
+)
+
 CACHE_MAX_SIZE = 1000
 CACHE_CLEANUP_COUNT = 100
+# Idempotency keys longer than this are cached under a fixed-size digest
+CACHE_KEY_DIGEST_THRESHOLD = 64
+
+# Potentially sensitive fragments of error messages, merged into one pattern so
+# sanitization is a single scan per error
+SENSITIVE_PATTERN = re.compile(
+    r"(?:password|token|key|secret|auth)[=:]\s*\S+"
+    r"|/Users/[^/\s]+"  # User paths
+    r"|/home/[^/\s]+"  # User paths
+    r"|file://[^\s]+",  # File URLs
+    re.IGNORECASE,
+)
+
+TOOL_NAME_PATTERN = re.compile(r"[a-zA-Z0-9_-]+")
+
+# Transport failures that are reported as MCP-Tx network errors. Other OSErrors, such as
+# PermissionError or FileNotFoundError, are not transient and are left as they are
+NETWORK_ERRORS: tuple[type[BaseException], ...] = (
+    ConnectionError,
+    TimeoutError,
+    socket.gaierror,
+    anyio.BrokenResourceError,
+    anyio.ClosedResourceError,
+    anyio.EndOfStream,
+)
+# Fallback for upstream errors that only describe a network failure in their message
+NETWORK_ERROR_PATTERN = re.compile(r"connection|network", re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=64)
+def _backoff_table(base_delay_ms: int, multiplier: float, max_delay_ms: int, max_attempts: int) -> tuple[float, ...]:
+    """Exponential backoff delays (before jitter) for each attempt of a retry policy."""
+    return tuple(min(base_delay_ms * multiplier**attempt, max_delay_ms) for attempt in range(max_attempts))
+
+
+def _cache_key(idempotency_key: str) -> str | bytes:
+    """Deduplication cache key: short keys as-is, long ones as a 16-byte BLAKE2b digest."""
+    if len(idempotency_key) <= CACHE_KEY_DIGEST_THRESHOLD:
+        return idempotency_key
+    return hashlib.blake2b(idempotency_key.encode(), digest_size=16).digest()
+
+
+@dataclasses.dataclass(slots=True)
+class _InFlightCall:
+    """A call running for an idempotency key, and the result handed to callers waiting on it."""
+
+    done: anyio.Event = dataclasses.field(default_factory=anyio.Event)
+    # The owner's result, already marked as a duplicate; None until the call returns
+    result: MCPTxResult | None = None
 
 
 class BaseSession(Protocol):
@@ -56,13 +120,29 @@ class MCPTxSession:
         self.config = config or MCPTxConfig()
         self._mcp_tx_enabled = False
         self._server_capabilities: dict[str, Any] = {}
+        # Request builder and tool call implementation, chosen once the server's MCP-Tx
+        # support is known
+        self._build_request = self._build_standard_request
+        self._dispatch = self._execute_standard_mcp_call
 
         # Request tracking
         self._active_requests: dict[str, RequestTracker] = {}
-        self._deduplication_cache: dict[str, tuple[MCPTxResult, datetime]] = {}
-
-        # Semaphore for concurrency control
-        self._request_semaphore = anyio.Semaphore(self.config.max_concurrent_requests)
+        self._active_requests_view = MappingProxyType(self._active_requests)
+        # Set when the last active request finishes while close() is waiting
+        self._drain_event: anyio.Event | None = None
+        # Cache entries are stamped with time.monotonic() and kept in insertion order,
+        # so the oldest entries are always at the front
+        self._deduplication_cache: OrderedDict[str | bytes, tuple[MCPTxResult, float]] = OrderedDict()
+        self._deduplication_window_s = self.config.deduplication_window_ms / 1000.0
+        self._cache_stats = {"hits": 0, "misses": 0}
+        # Calls currently running for an idempotency key, keyed like the cache
+        self._in_flight: dict[str | bytes, _InFlightCall] = {}
+
+        # Semaphore for concurrency control. It is held per attempt rather than per call, so
+        # requests sleeping between retries do not occupy a slot; the cost is one acquire per
+        # attempt. fast_acquire skips the extra event-loop yield when a slot is free; the tool
+        # call itself always awaits, so fairness is kept
+        self._request_semaphore = anyio.Semaphore(self.config.max_concurrent_requests, fast_acquire=True)
 
         logger.info("MCP-Tx session initialized with config: %s", self.config)
 
@@ -74,24 +154,10 @@ class MCPTxSession:
         """Async context manager exit."""
         await self.close()
 
-    def _sanitize_error_message(self, error: Exception) -> str:
+    def _sanitize_error_message(self, error: Exception | str) -> str:
         """Sanitize error message to prevent information leakage."""
-        error_str = str(error)
-
         # Remove potentially sensitive information
-        sensitive_patterns = [
-            r"password[=:]\s*\S+",
-            r"token[=:]\s*\S+",
-            r"key[=:]\s*\S+",
-            r"secret[=:]\s*\S+",
-            r"auth[=:]\s*\S+",
-            r"/Users/[^/\s]+",  # User paths
-            r"/home/[^/\s]+",  # User paths
-            r"file://[^\s]+",  # File URLs
-        ]
-
-        for pattern in sensitive_patterns:
-            error_str = re.sub(pattern, "[REDACTED]", error_str, flags=re.IGNORECASE)
+        error_str = SENSITIVE_PATTERN.sub("[REDACTED]", str(error))
 
         # Limit error message length
         if len(error_str) > 200:
@@ -103,34 +169,26 @@ class MCPTxSession:
         """
         Initialize the session with MCP-Tx capability negotiation.
         """
-        # Add MCP-Tx experimental capabilities to initialization
-        if "capabilities" not in kwargs:
-            kwargs["capabilities"] = {}
-
-        if "experimental" not in kwargs["capabilities"]:
-            kwargs["capabilities"]["experimental"] = {}
-
-        # Advertise MCP-Tx capabilities
-        kwargs["capabilities"]["experimental"]["mcp_tx"] = {
-            "version": "0.1.0",
-            "features": ["ack", "retry", "idempotency", "transactions"],
-        }
+        # Advertise MCP-Tx capabilities as an experimental capability (a plain dict copy so
+        # the underlying session can serialize it)
+        experimental = kwargs.setdefault("capabilities", {}).setdefault("experimental", {})
+        experimental["mcp_tx"] = dict(MCP_TX_CAPABILITIES)
 
         logger.debug("Initializing MCP session with MCP-Tx capabilities")
         result = await self.mcp_session.initialize(**kwargs)
 
         # Check if server supports MCP-Tx
-        if hasattr(result, "capabilities") and result.capabilities:
-            server_caps = result.capabilities
-            if hasattr(server_caps, "experimental") and server_caps.experimental:
-                self._server_capabilities = server_caps.experimental
-                if "mcp_tx" in self._server_capabilities:
-                    self._mcp_tx_enabled = True
-                    logger.info("MCP-Tx enabled - server supports MCP-Tx features")
-                else:
-                    logger.info("MCP-Tx disabled - server does not support MCP-Tx")
-            else:
-                logger.info("MCP-Tx disabled - no experimental capabilities from server")
+        experimental = getattr(getattr(result, "capabilities", None), "experimental", None) or {}
+        self._server_capabilities = experimental
+        if "mcp_tx" in experimental:
+            self._mcp_tx_enabled = True
+            self._build_request = self._build_mcp_tx_request
+            self._dispatch = self._execute_tool_call
+            logger.info("MCP-Tx enabled - server supports MCP-Tx features")
+        elif experimental:
+            logger.info("MCP-Tx disabled - server does not support MCP-Tx")
+        else:
+            logger.info("MCP-Tx disabled - no experimental capabilities from server")
 
         return result
 
@@ -159,17 +217,16 @@ class MCPTxSession:
         Raises:
             ValueError: If input validation fails
         """
-        # Input validation
-        if not name or not name.strip():
-            raise ValueError("Tool name must be a non-empty string")
-
-        if not re.match(r"^[a-zA-Z0-9_-]+$", name):
+        # Input validation - a valid name passes with a single regex match
+        if not isinstance(name, str) or not TOOL_NAME_PATTERN.fullmatch(name):
+            if not isinstance(name, str) or not name.strip():
+                raise ValueError("Tool name must be a non-empty string")
             raise ValueError("Tool name must contain only alphanumeric characters, hyphens, and underscores")
 
         if arguments is not None and not isinstance(arguments, dict):
             raise ValueError("Tool arguments must be a dictionary or None")
 
-        if idempotency_key is not None and (not idempotency_key or not idempotency_key.strip()):
+        if idempotency_key is not None and not idempotency_key.strip():
             raise ValueError("Idempotency key must be a non-empty string if provided")
 
         if timeout_ms is not None and (timeout_ms <= 0 or timeout_ms > 7200000):  # Max 2 hours
@@ -179,18 +236,52 @@ class MCPTxSession:
         effective_retry_policy = retry_policy or self.config.retry_policy
         effective_timeout = timeout_ms or self.config.default_timeout_ms
 
-        # Check deduplication cache first
         if idempotency_key:
+            key = _cache_key(idempotency_key)
+            # Share the outcome of a call already running with this key instead of repeating
+            # it, whether it succeeds or fails. The wait is bounded by this caller's timeout.
+            while (in_flight := self._in_flight.get(key)) is not None:
+                with anyio.move_on_after(effective_timeout / 1000.0):
+                    await in_flight.done.wait()
+                if in_flight.result is not None:
+                    logger.debug("Returning in-flight result for idempotency key: %s", idempotency_key)
+                    return in_flight.result
+                if not in_flight.done.is_set():
+                    return MCPTxResult(
+                        result=None,
+                        mcp_tx_meta=MCPTxResponse(
+                            ack=False,
+                            processed=False,
+                            attempts=0,
+                            final_status="failed",
+                            error_code="MCP_TX_TIMEOUT",
+                            error_message=f"Timed out after {effective_timeout}ms waiting for in-flight call",
+                        ),
+                    )
+                # The owner was cancelled before producing a result; run the call here instead
+
+            # Check deduplication cache
             cached_result = self._get_cached_result(idempotency_key)
             if cached_result:
                 logger.debug("Returning cached result for idempotency key: %s", idempotency_key)
                 return cached_result
 
-        # Acquire semaphore for concurrency control
-        async with self._request_semaphore:
-            return await self._call_tool_with_retry(
-                name, arguments, idempotency_key, effective_timeout, effective_retry_policy
-            )
+            self._in_flight[key] = in_flight = _InFlightCall()
+            try:
+                result = await self._call_tool_with_retry(
+                    name, arguments, idempotency_key, effective_timeout, effective_retry_policy
+                )
+                in_flight.result = dataclasses.replace(
+                    result, mcp_tx_meta=dataclasses.replace(result.mcp_tx_meta, duplicate=True)
+                )
+                return result
+            finally:
+                del self._in_flight[key]
+                in_flight.done.set()
+
+        return await self._call_tool_with_retry(
+            name, arguments, idempotency_key, effective_timeout, effective_retry_policy
+        )
 
     async def _call_tool_with_retry(
         self,
@@ -204,30 +295,52 @@ class MCPTxSession:
         mcp_tx_meta = MCPTxMeta(idempotency_key=idempotency_key, timeout_ms=timeout_ms)
 
         # Track request
+        now = datetime.utcnow()
+        now_ns = time.monotonic_ns()
         tracker = RequestTracker(
             request_id=mcp_tx_meta.request_id,
             transaction_id=mcp_tx_meta.transaction_id,
             status=MessageStatus.PENDING,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow(),
+            created_at=now,
+            updated_at=now,
+            created_ns=now_ns,
+            updated_ns=now_ns,
         )
         self._active_requests[mcp_tx_meta.request_id] = tracker
 
+        # Build the request once; only the retry count changes between attempts
+        request, request_meta = self._build_request(name, arguments, mcp_tx_meta)
+
         last_error: Exception | None = None
+        # Sanitized message of last_error, computed once per failure
+        last_error_message = "Unknown error"
+        # Read once; the policy is a pydantic model and is consulted on every attempt
+        max_attempts = retry_policy.max_attempts
+
+        # Optional overall deadline: each attempt's timeout is clamped to the time left, and a
+        # backoff that would end past it only delays an inevitable failure. Without one, every
+        # attempt allowed by the policy is made.
+        total_timeout_ms = self.config.total_timeout_ms
+        deadline = None if total_timeout_ms is None else time.monotonic() + total_timeout_ms / 1000.0
 
         try:
-            for attempt in range(retry_policy.max_attempts):
+            for attempt in range(max_attempts):
                 mcp_tx_meta.retry_count = attempt
+                if request_meta is not None:
+                    request_meta["retry_count"] = attempt
                 tracker.attempts = attempt + 1
 
                 try:
                     tracker.update_status(MessageStatus.SENT)
-                    logger.debug(
-                        "Attempting tool call %s (attempt %d/%d)", name, attempt + 1, retry_policy.max_attempts
-                    )
+                    logger.debug("Attempting tool call %s (attempt %d/%d)", name, attempt + 1, max_attempts)
+
+                    attempt_timeout_ms = timeout_ms
+                    if deadline is not None:
+                        attempt_timeout_ms = min(timeout_ms, max(1, int((deadline - time.monotonic()) * 1000)))
 
-                    # Call tool with timeout
-                    result = await self._execute_tool_call(name, arguments, mcp_tx_meta, timeout_ms)
+                    # Call tool with timeout, holding a concurrency slot only while the call runs
+                    async with self._request_semaphore:
+                        result = await self._dispatch(request, attempt_timeout_ms)
 
                     # Success - update tracker and cache result
                     tracker.update_status(MessageStatus.ACKNOWLEDGED)
@@ -247,32 +360,37 @@ class MCPTxSession:
 
                 except Exception as e:
                     last_error = e
-                    tracker.update_status(MessageStatus.FAILED, self._sanitize_error_message(e))
+                    error_str = str(e)
+                    last_error_message = self._sanitize_error_message(error_str)
+                    tracker.update_status(MessageStatus.FAILED, last_error_message)
 
-                    logger.warning("Tool call attempt %d/%d failed: %s", attempt + 1, retry_policy.max_attempts, str(e))
+                    logger.warning("Tool call attempt %d/%d failed: %s", attempt + 1, max_attempts, error_str)
 
                     # Check if we should retry
-                    if attempt < retry_policy.max_attempts - 1:
-                        if self._should_retry(e, retry_policy):
+                    if attempt < max_attempts - 1:
+                        if self._should_retry(e, retry_policy, error_str):
                             delay = self._calculate_retry_delay(attempt, retry_policy)
+                            if deadline is not None and time.monotonic() + delay / 1000.0 >= deadline:
+                                logger.debug("Retry delay of %d ms exceeds total_timeout_ms", delay)
+                                break
                             logger.debug("Retrying in %d ms", delay)
                             await anyio.sleep(delay / 1000.0)
                             continue
                         else:
-                            logger.debug("Error not retryable: %s", str(e))
+                            logger.debug("Error not retryable: %s", error_str)
                             break
 
             # All retries exhausted
-            error_msg = self._sanitize_error_message(last_error) if last_error else "Unknown error"
-            tracker.update_status(MessageStatus.FAILED, error_msg)
+            tracker.update_status(MessageStatus.FAILED, last_error_message)
 
         finally:
             # Always clean up tracker regardless of success or failure
             self._active_requests.pop(mcp_tx_meta.request_id, None)
+            if not self._active_requests and self._drain_event is not None:
+                self._drain_event.set()
 
         # Return failure result
         error_code = getattr(last_error, "error_code", "UNKNOWN_ERROR")
-        sanitized_error = self._sanitize_error_message(last_error) if last_error else "Unknown error"
 
         return MCPTxResult(
             result=None,
@@ -280,27 +398,33 @@ class MCPTxSession:
                 ack=False,
                 processed=False,
                 duplicate=False,
-                attempts=retry_policy.max_attempts,
+                attempts=tracker.attempts,
                 final_status="failed",
                 error_code=error_code,
-                error_message=sanitized_error,
+                error_message=last_error_message,
             ),
         )
 
-    async def _execute_tool_call(
-        self, name: str, arguments: dict[str, Any] | None, mcp_tx_meta: MCPTxMeta, timeout_ms: int
-    ) -> Any:
-        """Execute the actual tool call with MCP-Tx metadata."""
-        if not self._mcp_tx_enabled:
-            # Fallback to standard MCP
-            return await self._execute_standard_mcp_call(name, arguments, timeout_ms)
-
-        # Enhanced MCP call with MCP-Tx metadata
-        request = {
-            "method": "tools/call",
-            "params": {"name": name, "arguments": arguments or {}, "_meta": {"mcp_tx": mcp_tx_meta.to_dict()}},
-        }
+    def _build_standard_request(
+        self, name: str, arguments: dict[str, Any] | None, mcp_tx_meta: MCPTxMeta
+    ) -> tuple[dict[str, Any], dict[str, Any] | None]:
+        """Build a standard MCP tools/call request, which carries no MCP-Tx metadata."""
+        return {"method": TOOLS_CALL_METHOD, "params": {"name": name, "arguments": arguments or {}}}, None
+
+    def _build_mcp_tx_request(
+        self, name: str, arguments: dict[str, Any] | None, mcp_tx_meta: MCPTxMeta
+    ) -> tuple[dict[str, Any], dict[str, Any] | None]:
+        """Build a tools/call request with MCP-Tx metadata.
+
+        Returns the request and its MCP-Tx metadata dict, which the caller updates in place
+        between retry attempts.
+        """
+        request_meta = mcp_tx_meta.to_dict()
+        params = {"name": name, "arguments": arguments or {}, "_meta": {"mcp_tx": request_meta}}
+        return {"method": TOOLS_CALL_METHOD, "params": params}, request_meta
 
+    async def _execute_tool_call(self, request: dict[str, Any], timeout_ms: int) -> Any:
+        """Execute the actual tool call with MCP-Tx metadata."""
         # Execute with timeout
         try:
             with anyio.move_on_after(timeout_ms / 1000.0) as cancel_scope:
@@ -311,16 +435,16 @@ class MCPTxSession:
 
             return response
 
+        except NETWORK_ERRORS as e:
+            raise MCPTxNetworkError(f"Network error during tool call: {e!s}", e) from e
         except Exception as e:
-            # Wrap network errors
-            if "connection" in str(e).lower() or "network" in str(e).lower():
-                raise MCPTxNetworkError(f"Network error during tool call: {e!s}", e)
+            error_str = str(e)
+            if NETWORK_ERROR_PATTERN.search(error_str):
+                raise MCPTxNetworkError(f"Network error during tool call: {error_str}", e)
             raise
 
-    async def _execute_standard_mcp_call(self, name: str, arguments: dict[str, Any] | None, timeout_ms: int) -> Any:
+    async def _execute_standard_mcp_call(self, request: dict[str, Any], timeout_ms: int) -> Any:
         """Execute standard MCP tool call without MCP-Tx enhancements."""
-        request = {"method": "tools/call", "params": {"name": name, "arguments": arguments or {}}}
-
         with anyio.move_on_after(timeout_ms / 1000.0) as cancel_scope:
             response = await self.mcp_session.send_request(request)
 
@@ -329,73 +453,76 @@ class MCPTxSession:
 
         return response
 
-    def _should_retry(self, error: Exception, retry_policy: RetryPolicy) -> bool:
-        """Determine if an error should trigger a retry."""
+    def _should_retry(self, error: Exception, retry_policy: RetryPolicy, error_str: str | None = None) -> bool:
+        """Determine if an error should trigger a retry.
+
+        ``error_str`` is ``str(error)`` when the caller has already computed it.
+        """
         if isinstance(error, MCPTxError):
             return error.retryable
 
-        error_str = str(error).upper()
-        return any(retryable_error in error_str for retryable_error in retry_policy.retryable_errors)
+        # Structured error codes or exception class names first, then the message for
+        # stringly-typed upstream errors
+        error_code = getattr(error, "error_code", None) or type(error).__name__
+        return retry_policy.matches(
+            error_code if isinstance(error_code, str) else None,
+            str(error) if error_str is None else error_str,
+        )
 
     def _calculate_retry_delay(self, attempt: int, retry_policy: RetryPolicy) -> int:
         """Calculate delay for retry attempt with exponential backoff and jitter."""
-        delay = min(retry_policy.base_delay_ms * (retry_policy.backoff_multiplier**attempt), retry_policy.max_delay_ms)
+        delay = _backoff_table(
+            retry_policy.base_delay_ms,
+            retry_policy.backoff_multiplier,
+            retry_policy.max_delay_ms,
+            retry_policy.max_attempts,
+        )[attempt]
 
         if retry_policy.jitter:
             # Add ±20% jitter
-            jitter = delay * 0.2 * (random.random() * 2 - 1)
-            delay = int(delay + jitter)
+            delay = random.uniform(delay * 0.8, delay * 1.2)
 
         # Ensure delay is always positive and within bounds
         return int(max(delay, retry_policy.base_delay_ms))
 
     def _get_cached_result(self, idempotency_key: str) -> MCPTxResult | None:
         """Get cached result for idempotency key."""
-        if idempotency_key in self._deduplication_cache:
-            cached_result, timestamp = self._deduplication_cache[idempotency_key]
-
-            # Check if cache entry is still valid
-            current_time = datetime.utcnow()
-            cutoff_time = current_time - timedelta(milliseconds=self.config.deduplication_window_ms)
-
+        # Expired entries are evicted first, so anything still cached is within the window
+        self._evict_expired(time.monotonic())
+        entry = self._deduplication_cache.get(_cache_key(idempotency_key))
+        if entry is None:
+            self._cache_stats["misses"] += 1
+            return None
+
+        self._cache_stats["hits"] += 1
+        # Entries are stored already marked as duplicates and are immutable, so they can be shared
+        return entry[0]
+
+    def _evict_expired(self, now: float) -> None:
+        """Drop expired cache entries from the front until the oldest one is still fresh."""
+        cache = self._deduplication_cache
+        cutoff_time = now - self._deduplication_window_s
+        while cache:
+            _, timestamp = next(iter(cache.values()))
             if timestamp >= cutoff_time:
-                # Return a copy with duplicate flag set to True
-                duplicate_response = MCPTxResponse(
-                    ack=cached_result.mcp_tx_meta.ack,
-                    processed=cached_result.mcp_tx_meta.processed,
-                    duplicate=True,  # Mark as duplicate
-                    attempts=cached_result.mcp_tx_meta.attempts,
-                    final_status=cached_result.mcp_tx_meta.final_status,
-                    error_code=cached_result.mcp_tx_meta.error_code,
-                    error_message=cached_result.mcp_tx_meta.error_message,
-                )
-                return MCPTxResult(result=cached_result.result, mcp_tx_meta=duplicate_response)
-            else:
-                # Entry expired, remove it
-                del self._deduplication_cache[idempotency_key]
-
-        return None
+                break
+            cache.popitem(last=False)
 
     def _cache_result(self, idempotency_key: str, result: MCPTxResult) -> None:
         """Cache result for deduplication with time-based eviction."""
-        current_time = datetime.utcnow()
-        self._deduplication_cache[idempotency_key] = (result, current_time)
-
-        # Clean up expired entries
-        cutoff_time = current_time - timedelta(milliseconds=self.config.deduplication_window_ms)
-        expired_keys = [key for key, (_, timestamp) in self._deduplication_cache.items() if timestamp < cutoff_time]
-        for key in expired_keys:
-            del self._deduplication_cache[key]
+        cache = self._deduplication_cache
+        current_time = time.monotonic()
+        key = _cache_key(idempotency_key)
+        # Only ever served to repeat callers, so build the duplicate-flagged copy once here
+        duplicate_response = dataclasses.replace(result.mcp_tx_meta, duplicate=True)
+        cache[key] = (dataclasses.replace(result, mcp_tx_meta=duplicate_response), current_time)
+        cache.move_to_end(key)
+        self._evict_expired(current_time)
 
         # Additional safety: if cache grows too large, remove oldest entries
-        if len(self._deduplication_cache) > CACHE_MAX_SIZE:
-            # Sort by timestamp and remove oldest entries
-            sorted_entries = sorted(
-                self._deduplication_cache.items(),
-                key=lambda x: x[1][1],  # Sort by timestamp
-            )
-            for key, _ in sorted_entries[:CACHE_CLEANUP_COUNT]:
-                del self._deduplication_cache[key]
+        if len(cache) > CACHE_MAX_SIZE:
+            for _ in range(CACHE_CLEANUP_COUNT):
+                cache.popitem(last=False)
 
     @property
     def mcp_tx_enabled(self) -> bool:
@@ -403,9 +530,24 @@ class MCPTxSession:
         return self._mcp_tx_enabled
 
     @property
-    def active_requests(self) -> dict[str, RequestTracker]:
-        """Currently active MCP-Tx requests."""
-        return self._active_requests.copy()
+    def active_requests(self) -> Mapping[str, RequestTracker]:
+        """Currently active MCP-Tx requests, as a live read-only view."""
+        return self._active_requests_view
+
+    @property
+    def cache_stats(self) -> dict[str, Any]:
+        """Idempotency cache statistics: hits, misses, hit rate and current size."""
+        hits = self._cache_stats["hits"]
+        lookups = hits + self._cache_stats["misses"]
+        return {
+            **self._cache_stats,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "size": len(self._deduplication_cache),
+        }
+
+    def active_requests_snapshot(self) -> dict[str, RequestTracker]:
+        """Copy of the currently active MCP-Tx requests that will not change as requests complete."""
+        return dict(self._active_requests)
 
     async def close(self) -> None:
         """Close the MCP-Tx session and underlying MCP session."""
@@ -414,8 +556,9 @@ class MCPTxSession:
         # Wait for active requests to complete or timeout
         if self._active_requests:
             logger.info("Waiting for %d active requests to complete", len(self._active_requests))
-            # Give requests a chance to complete
-            await anyio.sleep(0.1)
+            self._drain_event = anyio.Event()
+            with anyio.move_on_after(self.config.close_timeout_ms / 1000.0):
+                await self._drain_event.wait()
 
         # Close underlying MCP session
         if hasattr(self.mcp_session, "close"):
@@ -4,11 +4,14 @@ MCP-Tx core types and data structures.
 
 from __future__ import annotations
 
+import functools
+import re
+import time
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any
+from typing import Any, ClassVar
 
 from pydantic import BaseModel, Field
 
@@ -35,12 +38,24 @@ class TransactionStatus(str, Enum):
     ROLLED_BACK = "rolled_back"
 
 
-@dataclass
+@dataclass(slots=True)
 class MCPTxMeta:
     """MCP-Tx metadata for message enhancement."""
 
+    _FIELDS: ClassVar[tuple[str, ...]] = (
+        "version",
+        "request_id",
+        "transaction_id",
+        "idempotency_key",
+        "expect_ack",
+        "retry_count",
+        "timeout_ms",
+        "timestamp",
+        "correlation_id",
+    )
+
     version: str = "0.1.0"
-    request_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    request_id: str = field(default_factory=lambda: uuid.uuid4().hex)
     transaction_id: str | None = None
     idempotency_key: str | None = None
     expect_ack: bool = True
@@ -51,13 +66,23 @@ class MCPTxMeta:
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
-        return {k: v for k, v in self.__dict__.items() if v is not None}
+        return {name: value for name in self._FIELDS if (value := getattr(self, name)) is not None}
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MCPTxResponse:
     """MCP-Tx response metadata."""
 
+    _FIELDS: ClassVar[tuple[str, ...]] = (
+        "ack",
+        "processed",
+        "duplicate",
+        "attempts",
+        "final_status",
+        "error_code",
+        "error_message",
+    )
+
     ack: bool
     processed: bool
     duplicate: bool = False
@@ -68,7 +93,16 @@ class MCPTxResponse:
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
-        return {k: v for k, v in self.__dict__.items() if v is not None}
+        return {name: value for name in self._FIELDS if (value := getattr(self, name)) is not None}
+
+
+@functools.lru_cache(maxsize=64)
+def _retryable_error_matchers(retryable_errors: tuple[str, ...]) -> tuple[frozenset[str], re.Pattern[str] | None]:
+    """Uppercased error set and case-insensitive message pattern (None if empty) for a policy."""
+    error_set = frozenset(error.upper() for error in retryable_errors)
+    if not retryable_errors:
+        return error_set, None
+    return error_set, re.compile("|".join(re.escape(error) for error in retryable_errors), re.IGNORECASE)
 
 
 class RetryPolicy(BaseModel):
@@ -83,6 +117,18 @@ class RetryPolicy(BaseModel):
         default_factory=lambda: ["CONNECTION_ERROR", "TIMEOUT", "NETWORK_ERROR", "TEMPORARY_FAILURE"]
     )
 
+    def matches(self, error_code: str | None, message: str) -> bool:
+        """Whether an error is retryable under this policy.
+
+        The error code (or exception class name) is compared case-insensitively against
+        ``retryable_errors``; failing that, the message is searched for any of them.
+        """
+        # Derived from the current list on each call, so changes to the field are always seen
+        error_set, pattern = _retryable_error_matchers(tuple(self.retryable_errors))
+        if error_code is not None and error_code.upper() in error_set:
+            return True
+        return pattern is not None and pattern.search(message) is not None
+
 
 class MCPTxConfig(BaseModel):
     """Configuration for MCP-Tx session."""
@@ -92,11 +138,14 @@ class MCPTxConfig(BaseModel):
     default_timeout_ms: int = Field(default=30000, ge=1000, le=600000)  # 1s to 10min
     max_concurrent_requests: int = Field(default=10, ge=1, le=100)
     deduplication_window_ms: int = Field(default=300000, ge=10000, le=3600000)  # 10s to 1hr
+    close_timeout_ms: int = Field(default=5000, ge=0, le=600000)  # 0 to 10min
+    # Optional overall deadline per call_tool, across all attempts and backoffs (None: no limit)
+    total_timeout_ms: int | None = Field(default=None, ge=1, le=7200000)  # up to 2 hours
     enable_transactions: bool = Field(default=True)
     enable_monitoring: bool = Field(default=True)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MCPTxResult:
     """Result wrapper containing both MCP result and MCP-Tx metadata."""
 
@@ -172,9 +221,13 @@ class MCPTxSequenceError(MCPTxError):
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class RequestTracker:
-    """Tracks the lifecycle of an MCP-Tx request."""
+    """Tracks the lifecycle of an MCP-Tx request.
+
+    ``created_at`` and ``updated_at`` are wall-clock times. ``created_ns`` and ``updated_ns``
+    are ``time.monotonic_ns()`` values for measuring durations, unaffected by clock changes.
+    """
 
     request_id: str
     transaction_id: str | None
@@ -183,10 +236,13 @@ class RequestTracker:
     updated_at: datetime
     attempts: int = 0
     last_error: str | None = None
+    created_ns: int = field(default_factory=time.monotonic_ns)
+    updated_ns: int = field(default_factory=time.monotonic_ns)
 
     def update_status(self, status: MessageStatus, error: str | None = None) -> None:
-        """Update request status and timestamp."""
+        """Update request status and timestamps."""
         self.status = status
         self.updated_at = datetime.utcnow()
+        self.updated_ns = time.monotonic_ns()
         if error:
             self.last_error = error
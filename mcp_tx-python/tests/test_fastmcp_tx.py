@@ -1,5 +1,7 @@
 """Tests for FastMCPTx decorator-based API."""
 
+import json
+from dataclasses import FrozenInstanceError, replace
 from unittest.mock import AsyncMock
 
 import anyio
@@ -7,6 +9,21 @@ import pytest
 
 from mcp_tx import FastMCPTx, MCPTxResponse, MCPTxResult, RetryPolicy
 
+# Responses are frozen, so one instance can back every mocked successful call
+SUCCESS_RESPONSE = MCPTxResponse(ack=True, processed=True, duplicate=False, attempts=1, final_status="success")
+
+
+class FakeMCPSession:
+    """Minimal MCP session stub exposing only the methods FastMCPTx uses."""
+
+    __slots__ = ("call_tool", "close", "initialize", "send_request")
+
+    def __init__(self) -> None:
+        self.initialize = AsyncMock()
+        self.send_request = AsyncMock()
+        self.call_tool = AsyncMock()
+        self.close = AsyncMock()
+
 
 class TestFastMCPTx:
     """Test FastMCPTx decorator functionality."""
@@ -14,9 +31,7 @@ class TestFastMCPTx:
     @pytest.fixture
     def mock_mcp_session(self):
         """Create a mock MCP session."""
-        session = AsyncMock()
-        session.call_tool = AsyncMock()
-        return session
+        return FakeMCPSession()
 
     @pytest.fixture
     async def fastmcptx_app(self, mock_mcp_session):
@@ -29,7 +44,7 @@ class TestFastMCPTx:
         """Test FastMCPTx app creation."""
         app = FastMCPTx(mock_mcp_session, name="Test App")
         assert app.name == "Test App"
-        assert not app._initialized
+        assert app._mcp_tx_session is None
         assert app.list_tools() == []
 
     def test_tool_decorator_basic(self, mock_mcp_session):
@@ -89,6 +104,27 @@ class TestFastMCPTx:
         assert info["has_retry_policy"]
         assert info["timeout_ms"] == 30000
 
+    @pytest.mark.anyio
+    async def test_tool_dispatcher(self, mock_mcp_session):
+        """Test that registered tools expose an awaitable dispatcher for sync and async functions."""
+        app = FastMCPTx(mock_mcp_session)
+
+        @app.tool()
+        def sync_tool(x: int) -> int:
+            return x * 2
+
+        @app.tool()
+        async def async_tool(x: int) -> int:
+            return x + 1
+
+        sync_entry = app._registry.get_tool("sync_tool")
+        async_entry = app._registry.get_tool("async_tool")
+        assert sync_entry is not None and async_entry is not None
+
+        assert async_entry.dispatcher is async_tool
+        assert await sync_entry.dispatcher(x=21) == 42
+        assert await async_entry.dispatcher(1) == 2
+
     def test_tool_decorator_wrong_usage(self, mock_mcp_session):
         """Test error handling for incorrect decorator usage."""
         app = FastMCPTx(mock_mcp_session)
@@ -112,9 +148,7 @@ class TestFastMCPTx:
         fastmcptx_app._mcp_tx_session.call_tool = AsyncMock(
             return_value=MCPTxResult(
                 result={"output": "42"},
-                mcp_tx_meta=MCPTxResponse(
-                    ack=True, processed=True, duplicate=False, attempts=1, final_status="success"
-                ),
+                mcp_tx_meta=SUCCESS_RESPONSE,
             )
         )
 
@@ -148,9 +182,7 @@ class TestFastMCPTx:
         fastmcptx_app._mcp_tx_session.call_tool = AsyncMock(
             return_value=MCPTxResult(
                 result={"output": "HELLO"},
-                mcp_tx_meta=MCPTxResponse(
-                    ack=True, processed=True, duplicate=False, attempts=2, final_status="success"
-                ),
+                mcp_tx_meta=replace(SUCCESS_RESPONSE, attempts=2),
             )
         )
 
@@ -184,9 +216,7 @@ class TestFastMCPTx:
         fastmcptx_app._mcp_tx_session.call_tool = AsyncMock(
             return_value=MCPTxResult(
                 result={"output": "Processed update for user123"},
-                mcp_tx_meta=MCPTxResponse(
-                    ack=True, processed=True, duplicate=False, attempts=1, final_status="success"
-                ),
+                mcp_tx_meta=SUCCESS_RESPONSE,
             )
         )
 
@@ -226,10 +256,10 @@ class TestFastMCPTx:
         """Test FastMCPTx as async context manager."""
         app = FastMCPTx(mock_mcp_session, name="Context Test")
 
-        assert not app._initialized
+        assert app._mcp_tx_session is None
 
         async with app:
-            assert app._initialized
+            assert app._mcp_tx_session is not None
 
             @app.tool()
             def context_tool() -> str:
@@ -239,9 +269,7 @@ class TestFastMCPTx:
             app._mcp_tx_session.call_tool = AsyncMock(
                 return_value=MCPTxResult(
                     result={"output": "works"},
-                    mcp_tx_meta=MCPTxResponse(
-                        ack=True, processed=True, duplicate=False, attempts=1, final_status="success"
-                    ),
+                    mcp_tx_meta=SUCCESS_RESPONSE,
                 )
             )
 
@@ -314,14 +342,28 @@ class TestFastMCPTx:
     async def test_concurrent_initialization(self, mock_mcp_session):
         """Test concurrent initialization safety."""
         app = FastMCPTx(mock_mcp_session)
+        start = anyio.Event()
 
-        # Start multiple initialization tasks concurrently
+        async def slow_initialize(**kwargs):
+            # Yield while the first initialization is in progress so the others contend for the lock
+            await anyio.sleep(0.01)
+
+        mock_mcp_session.initialize.side_effect = slow_initialize
+
+        async def racer():
+            await start.wait()
+            await app.initialize()
+
+        # Release all initialization tasks at once
         async with anyio.create_task_group() as tg:
             for _ in range(5):
-                tg.start_soon(app.initialize)
+                tg.start_soon(racer)
+            await anyio.wait_all_tasks_blocked()
+            start.set()
 
         # Should only be initialized once
-        assert app._initialized
+        assert app._mcp_tx_session is not None
+        assert mock_mcp_session.initialize.await_count == 1
 
     @pytest.mark.anyio
     async def test_get_all_tools_info_with_none_values(self, fastmcptx_app):
@@ -355,60 +397,78 @@ class TestFastMCPTx:
         def concurrent_tool(value: int) -> int:
             return value * 2
 
-        # Mock MCP-Tx session response
+        # Mock MCP-Tx session responses, built up front so the calls only do dispatch
+        results_by_value = {i: MCPTxResult(result={"output": i * 2}, mcp_tx_meta=SUCCESS_RESPONSE) for i in range(10)}
         fastmcptx_app._mcp_tx_session.call_tool = AsyncMock(
-            side_effect=lambda name, arguments, **kwargs: MCPTxResult(
-                result={"output": arguments["value"] * 2},
-                mcp_tx_meta=MCPTxResponse(
-                    ack=True, processed=True, duplicate=False, attempts=1, final_status="success"
-                ),
-            )
+            side_effect=lambda name, arguments, **kwargs: results_by_value[arguments["value"]]
         )
 
         # Execute multiple concurrent tool calls
+        outputs: list[int | None] = [None] * 10
+
         async def make_concurrent_call(value: int):
-            return await fastmcptx_app.call_tool("concurrent_tool", {"value": value})
+            result = await fastmcptx_app.call_tool("concurrent_tool", {"value": value})
+            outputs[value] = result.result["output"]
 
         # Start 10 concurrent calls
         async with anyio.create_task_group() as tg:
             for i in range(10):
                 tg.start_soon(make_concurrent_call, i)
 
-        # Verify MCP-Tx session was called for each task
+        # Verify MCP-Tx session was called for each task and each caller got its own result
         assert fastmcptx_app._mcp_tx_session.call_tool.call_count == 10
+        assert outputs == [i * 2 for i in range(10)]
 
     @pytest.mark.anyio
-    async def test_deep_copy_protection(self, fastmcptx_app):
+    async def test_tool_config_copy_protection(self, fastmcptx_app):
         """Test that tool configurations are protected from mutation."""
 
         @fastmcptx_app.tool(timeout_ms=5000)
         def protected_tool() -> str:
             return "protected"
 
-        # Get tool config twice
-        config1 = fastmcptx_app._registry.get_tool("protected_tool")
-        config2 = fastmcptx_app._registry.get_tool("protected_tool")
+        config = fastmcptx_app._registry.get_tool("protected_tool")
+        assert config is not None
+
+        # Registered configurations are frozen
+        with pytest.raises(FrozenInstanceError):
+            config.timeout_ms = 9999  # type: ignore[misc]
+
+        assert fastmcptx_app._registry.get_tool("protected_tool").timeout_ms == 5000
+
+    def test_tool_info_is_serializable_and_isolated(self, mock_mcp_session):
+        """Test that tool info is returned as plain dicts that callers cannot use to alter the registry."""
+        app = FastMCPTx(mock_mcp_session)
+
+        @app.tool()
+        def first_tool() -> str:
+            return "first"
+
+        info = app.get_tool_info("first_tool")
+        all_info = app.get_all_tools_info()
+        assert json.loads(json.dumps(all_info)) == {"first_tool": info}
 
-        # They should be separate objects
-        assert config1 is not config2
+        info["timeout_ms"] = 1
+        all_info["first_tool"]["description"] = "changed"
+        assert app.get_tool_info("first_tool")["timeout_ms"] is None
+        assert app.get_tool_info("first_tool")["description"] is None
 
-        # Modifying one shouldn't affect the other
-        if config1:
-            config1["timeout_ms"] = 9999
+        @app.tool()
+        def second_tool() -> str:
+            return "second"
 
-        if config2:
-            assert config2["timeout_ms"] == 5000  # Should remain unchanged
+        assert set(app.get_all_tools_info()) == {"first_tool", "second_tool"}
 
     def test_optimized_get_all_tools_info_performance(self, mock_mcp_session):
         """Test that get_all_tools_info is efficiently implemented."""
         app = FastMCPTx(mock_mcp_session)
 
-        # Register multiple tools
-        for i in range(100):
+        def test_tool() -> str:
+            return "tool"
 
-            @app.tool(name=f"tool_{i}", timeout_ms=1000 + i)
-            def test_tool() -> str:
-                return f"tool_{i}"
+        # Register multiple tools directly with the registry; the decorator path is covered above
+        for i in range(100):
+            app._registry.register_tool(f"tool_{i}", test_tool, timeout_ms=1000 + i)
 
         # This should be efficient (single dict iteration, not multiple lookups)
         all_info = app.get_all_tools_info()
@@ -420,24 +480,21 @@ class TestFastMCPTx:
             assert all_info[tool_name]["timeout_ms"] == 1000 + i
 
     @pytest.mark.anyio
-    async def test_input_validation(self, fastmcptx_app):
+    @pytest.mark.parametrize(
+        ("name", "arguments", "idempotency_key", "message"),
+        [
+            ("", {"x": 1}, None, "Tool name must be a non-empty string"),
+            ("   ", {"x": 1}, None, "Tool name must be a non-empty string"),
+            ("test_tool", "not a dict", None, "Arguments must be a dictionary or None"),
+            ("test_tool", {"x": 1}, 123, "Idempotency key must be a string or None"),
+        ],
+    )
+    async def test_input_validation(self, fastmcptx_app, name, arguments, idempotency_key, message):
         """Test input validation for call_tool method."""
 
         @fastmcptx_app.tool()
         def test_tool(x: int) -> str:
             return str(x)
 
-        # Test invalid tool name
-        with pytest.raises(ValueError, match="Tool name must be a non-empty string"):
-            await fastmcptx_app.call_tool("", {"x": 1})
-
-        with pytest.raises(ValueError, match="Tool name must be a non-empty string"):
-            await fastmcptx_app.call_tool("   ", {"x": 1})
-
-        # Test invalid arguments
-        with pytest.raises(ValueError, match="Arguments must be a dictionary or None"):
-            await fastmcptx_app.call_tool("test_tool", "not a dict")  # type: ignore
-
-        # Test invalid idempotency key
-        with pytest.raises(ValueError, match="Idempotency key must be a string or None"):
-            await fastmcptx_app.call_tool("test_tool", {"x": 1}, idempotency_key=123)  # type: ignore
+        with pytest.raises(ValueError, match=message):
+            await fastmcptx_app.call_tool(name, arguments, idempotency_key=idempotency_key)
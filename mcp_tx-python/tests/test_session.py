@@ -6,8 +6,11 @@ from unittest.mock import AsyncMock, MagicMock
 import anyio
 import pytest
 
-from mcp_tx.session import MCPTxSession
-from mcp_tx.types import MCPTxConfig, RetryPolicy
+from mcp_tx.session import CACHE_CLEANUP_COUNT, CACHE_KEY_DIGEST_THRESHOLD, CACHE_MAX_SIZE, MCPTxSession
+from mcp_tx.types import MCPTxConfig, MCPTxResponse, MCPTxResult, RetryPolicy
+
+# Shared by every successful mock call; the session only wraps it and never modifies it
+SUCCESS_RESPONSE = {"result": {"content": [{"type": "text", "text": "Tool executed successfully"}]}}
 
 
 class MockMCPSession:
@@ -17,6 +20,7 @@ class MockMCPSession:
         self.should_fail = should_fail
         self.supports_mcp_tx = supports_mcp_tx
         self.call_count = 0
+        self.sent_retry_counts: list[int] = []
 
     async def initialize(self, **kwargs) -> Any:
         """Mock initialize method."""
@@ -33,12 +37,13 @@ class MockMCPSession:
     async def send_request(self, request: dict[str, Any]) -> Any:
         """Mock send_request method."""
         self.call_count += 1
+        if "_meta" in request["params"]:
+            self.sent_retry_counts.append(request["params"]["_meta"]["mcp_tx"]["retry_count"])
 
         if self.should_fail and self.call_count <= 2:  # Fail first 2 attempts
             raise Exception("Network error")
 
-        # Mock successful response
-        return {"result": {"content": [{"type": "text", "text": "Tool executed successfully"}]}}
+        return SUCCESS_RESPONSE
 
 
 @pytest.mark.anyio
@@ -55,6 +60,20 @@ async def test_mcp_tx_session_initialization():
     assert result is not None
 
 
+@pytest.mark.anyio
+async def test_mcp_tx_enabled_for_non_dict_capability():
+    """Test that any advertised mcp_tx capability enables MCP-Tx, whatever its shape."""
+    mock_mcp = MockMCPSession(supports_mcp_tx=True)
+    result = MagicMock()
+    result.capabilities.experimental = {"mcp_tx": True}
+    mock_mcp.initialize = AsyncMock(return_value=result)
+    mcp_tx_session = MCPTxSession(mock_mcp)
+
+    await mcp_tx_session.initialize()
+
+    assert mcp_tx_session.mcp_tx_enabled is True
+
+
 @pytest.mark.anyio
 async def test_mcp_tx_session_fallback():
     """Test MCP-Tx session fallback when server doesn't support MCP-Tx."""
@@ -67,6 +86,12 @@ async def test_mcp_tx_session_fallback():
     # Should detect no MCP-Tx support
     assert mcp_tx_session.mcp_tx_enabled is False
 
+    # Tool calls go out as plain MCP requests without MCP-Tx metadata
+    result = await mcp_tx_session.call_tool("test_tool", {})
+    assert result.ack is True
+    assert mock_mcp.call_count == 1
+    assert mock_mcp.sent_retry_counts == []
+
 
 @pytest.mark.anyio
 async def test_successful_tool_call():
@@ -114,6 +139,7 @@ async def test_tool_call_with_retry():
     assert result.final_status == "completed"
     assert result.attempts == 3  # Should have retried
     assert mock_mcp.call_count == 3
+    assert mock_mcp.sent_retry_counts == [0, 1, 2]
 
 
 @pytest.mark.anyio
@@ -172,11 +198,112 @@ async def test_idempotency_key_deduplication():
     assert result2.ack is True  # Still successful
     assert result2.mcp_tx_meta is not None
     assert result2.mcp_tx_meta.duplicate is True  # But marked as duplicate
+    assert result2.result == result1.result
+
+    # The original result is not altered by caching a duplicate
+    assert result1.mcp_tx_meta.duplicate is False
+
+    # Later hits share the same pre-built duplicate
+    result3 = await mcp_tx_session.call_tool("test_tool", {}, idempotency_key=idempotency_key)
+    assert result3 is result2
 
     # Should only have called MCP once
     assert mock_mcp.call_count == 1
 
 
+@pytest.mark.anyio
+async def test_concurrent_calls_with_same_idempotency_key_run_once():
+    """Test that concurrent calls sharing an idempotency key reuse the result of the one in flight."""
+    mock_mcp = MockMCPSession(supports_mcp_tx=True)
+    calls = 0
+
+    async def slow_send_request(request):
+        nonlocal calls
+        calls += 1
+        await anyio.sleep(0.05)
+        return {"result": "ok"}
+
+    mock_mcp.send_request = slow_send_request
+    mcp_tx_session = MCPTxSession(mock_mcp)
+    await mcp_tx_session.initialize()
+    results = []
+
+    async def call():
+        results.append(await mcp_tx_session.call_tool("test_tool", {}, idempotency_key="shared-key"))
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(3):
+            tg.start_soon(call)
+
+    assert calls == 1
+    assert [r.ack for r in results] == [True, True, True]
+    assert sorted(r.mcp_tx_meta.duplicate for r in results) == [False, True, True]
+    assert mcp_tx_session._in_flight == {}
+
+
+@pytest.mark.anyio
+async def test_waiters_share_failed_in_flight_result():
+    """Test that callers parked on a failing call get its failure instead of retrying in turn."""
+    mock_mcp = MockMCPSession(supports_mcp_tx=True)
+    calls = 0
+
+    async def failing_send_request(request):
+        nonlocal calls
+        calls += 1
+        await anyio.sleep(0.05)
+        raise ConnectionError("Connection reset")
+
+    mock_mcp.send_request = failing_send_request
+    policy = RetryPolicy(max_attempts=2, base_delay_ms=100, jitter=False)
+    mcp_tx_session = MCPTxSession(mock_mcp, MCPTxConfig(retry_policy=policy))
+    await mcp_tx_session.initialize()
+    results = []
+
+    async def call():
+        results.append(await mcp_tx_session.call_tool("test_tool", {}, idempotency_key="shared-key"))
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(4):
+            tg.start_soon(call)
+
+    # Only the owner ran its retry cycle; the three waiters got its failure as duplicates
+    assert calls == 2
+    assert [r.ack for r in results] == [False] * 4
+    assert [r.mcp_tx_meta.duplicate for r in results] == [False, True, True, True]
+    assert {r.mcp_tx_meta.attempts for r in results} == {2}
+    assert mcp_tx_session._in_flight == {}
+
+
+@pytest.mark.anyio
+async def test_in_flight_wait_bounded_by_caller_timeout():
+    """Test that waiting on a call with the same idempotency key honours the waiter's timeout."""
+    mock_mcp = MockMCPSession(supports_mcp_tx=True)
+
+    async def slow_send_request(request):
+        await anyio.sleep(0.3)
+        return {"result": "ok"}
+
+    mock_mcp.send_request = slow_send_request
+    mcp_tx_session = MCPTxSession(mock_mcp)
+    await mcp_tx_session.initialize()
+    results = {}
+
+    async def call(label, timeout_ms):
+        results[label] = await mcp_tx_session.call_tool(
+            "test_tool", {}, idempotency_key="shared-key", timeout_ms=timeout_ms
+        )
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(call, "owner", 1000)
+        await anyio.sleep(0.01)
+        tg.start_soon(call, "waiter", 50)
+
+    assert results["owner"].ack is True
+    assert results["waiter"].ack is False
+    assert results["waiter"].mcp_tx_meta.error_code == "MCP_TX_TIMEOUT"
+    assert results["waiter"].mcp_tx_meta.attempts == 0
+
+
 @pytest.mark.anyio
 async def test_timeout_handling():
     """Test timeout handling in tool calls."""
@@ -194,11 +321,12 @@ async def test_timeout_handling():
     mcp_tx_session = MCPTxSession(mock_mcp)
     await mcp_tx_session.initialize()
 
-    # Call with very short timeout
+    # Call with very short timeout; short backoffs keep the retries quick
     result = await mcp_tx_session.call_tool(
         "test_tool",
         {"arg": "value"},
         timeout_ms=50,  # 50ms timeout, should fail
+        retry_policy=RetryPolicy(base_delay_ms=100, jitter=False),
     )
 
     # Should have timed out
@@ -208,6 +336,7 @@ async def test_timeout_handling():
     assert result.mcp_tx_meta is not None
     assert result.mcp_tx_meta.error_message is not None
     assert "timeout" in result.mcp_tx_meta.error_message.lower()
+    assert result.attempts == 3
 
 
 @pytest.mark.anyio
@@ -217,28 +346,18 @@ async def test_concurrent_requests():
     mcp_tx_session = MCPTxSession(mock_mcp)
     await mcp_tx_session.initialize()
 
-    # Launch multiple concurrent requests
+    # Launch multiple concurrent requests, each storing its result in its own slot
+    results: list[Any] = [None] * 5
+
     async def run_tool_call(i):
-        result = await mcp_tx_session.call_tool(f"test_tool_{i}", {"arg": f"value_{i}"})
-        return result
+        results[i] = await mcp_tx_session.call_tool(f"test_tool_{i}", {"arg": f"value_{i}"})
 
-    # Create and await coroutines concurrently using async nursery pattern
-    results = []
     async with anyio.create_task_group() as tg:
-
-        async def collect_result(i):
-            result = await mcp_tx_session.call_tool(f"test_tool_{i}", {"arg": f"value_{i}"})
-            results.append((i, result))
-
         for i in range(5):
-            tg.start_soon(collect_result, i)
-
-    # Sort results by index to maintain order
-    results.sort(key=lambda x: x[0])
-    results = [result for _, result in results]
+            tg.start_soon(run_tool_call, i)
 
     # All should succeed
-    for i, result in enumerate(results):
+    for result in results:
         assert result.ack is True
         assert result.processed is True
         assert result.final_status == "completed"
@@ -280,36 +399,127 @@ async def test_session_close():
 
 
 @pytest.mark.anyio
-async def test_input_validation():
-    """Test input validation for tool calls."""
+async def test_session_close_waits_for_active_requests():
+    """Test that close() returns as soon as in-flight requests finish."""
     mock_mcp = MockMCPSession(supports_mcp_tx=True)
+    mock_mcp.close = AsyncMock()
+    results = []
+
+    async def slow_send_request(request):
+        await anyio.sleep(0.2)
+        return {"result": "ok"}
+
+    mock_mcp.send_request = slow_send_request
     mcp_tx_session = MCPTxSession(mock_mcp)
     await mcp_tx_session.initialize()
 
-    # Test invalid tool names
-    with pytest.raises(ValueError, match="Tool name must be a non-empty string"):
-        await mcp_tx_session.call_tool("", {})
+    async def call():
+        results.append(await mcp_tx_session.call_tool("test_tool", {}))
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(call)
+        await anyio.sleep(0.05)
+        assert len(mcp_tx_session.active_requests) == 1
+
+        with anyio.fail_after(1):
+            await mcp_tx_session.close()
+
+        # The request completed before the underlying session was closed
+        assert len(results) == 1
+        assert results[0].ack is True
+        mock_mcp.close.assert_called_once()
+
+
+@pytest.mark.anyio
+async def test_session_close_gives_up_after_close_timeout():
+    """Test that close() stops waiting for stuck requests after close_timeout_ms."""
+    mock_mcp = MockMCPSession(supports_mcp_tx=True)
+    mock_mcp.close = AsyncMock()
+    release = anyio.Event()
+
+    async def stuck_send_request(request):
+        await release.wait()
+        return {"result": "ok"}
+
+    mock_mcp.send_request = stuck_send_request
+    mcp_tx_session = MCPTxSession(mock_mcp, MCPTxConfig(close_timeout_ms=50))
+    await mcp_tx_session.initialize()
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(mcp_tx_session.call_tool, "test_tool", {})
+        await anyio.sleep(0.01)
+
+        with anyio.fail_after(1):
+            await mcp_tx_session.close()
+
+        mock_mcp.close.assert_called_once()
+        release.set()
+
+
+@pytest.mark.anyio
+async def test_retry_backoff_releases_concurrency_slot():
+    """Test that a request waiting to retry does not hold a concurrency slot."""
+    mock_mcp = MockMCPSession(supports_mcp_tx=True)
+    attempts: dict[str, int] = {}
+
+    async def send_request(request):
+        name = request["params"]["name"]
+        attempts[name] = attempts.get(name, 0) + 1
+        if name == "flaky_tool" and attempts[name] == 1:
+            raise ConnectionError("Connection reset")
+        return {"result": name}
+
+    mock_mcp.send_request = send_request
+    config = MCPTxConfig(
+        max_concurrent_requests=1,
+        retry_policy=RetryPolicy(max_attempts=2, base_delay_ms=500, jitter=False),
+    )
+    mcp_tx_session = MCPTxSession(mock_mcp, config)
+    await mcp_tx_session.initialize()
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(mcp_tx_session.call_tool, "flaky_tool", {})
+        await anyio.sleep(0.05)
+        assert attempts == {"flaky_tool": 1}
 
-    with pytest.raises(ValueError, match="Tool name must be a non-empty string"):
-        await mcp_tx_session.call_tool("   ", {})
+        # The only slot is free while flaky_tool backs off
+        with anyio.fail_after(0.2):
+            result = await mcp_tx_session.call_tool("other_tool", {})
+        assert result.ack is True
+        assert attempts == {"flaky_tool": 1, "other_tool": 1}
 
-    with pytest.raises(ValueError, match="alphanumeric characters"):
-        await mcp_tx_session.call_tool("invalid@tool", {})
+    assert attempts["flaky_tool"] == 2
 
-    # Test invalid arguments
-    with pytest.raises(ValueError, match="must be a dictionary"):
-        await mcp_tx_session.call_tool("test_tool", "invalid")
 
-    # Test invalid timeout
-    with pytest.raises(ValueError, match="Timeout must be between"):
-        await mcp_tx_session.call_tool("test_tool", {}, timeout_ms=0)
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    ("name", "arguments", "options", "message"),
+    [
+        # Invalid tool names
+        (None, {}, {}, "Tool name must be a non-empty string"),
+        ("", {}, {}, "Tool name must be a non-empty string"),
+        ("   ", {}, {}, "Tool name must be a non-empty string"),
+        ("invalid@tool", {}, {}, "alphanumeric characters"),
+        ("test_tool\n", {}, {}, "alphanumeric characters"),
+        # Invalid arguments
+        ("test_tool", "invalid", {}, "must be a dictionary"),
+        # Invalid timeouts
+        ("test_tool", {}, {"timeout_ms": 0}, "Timeout must be between"),
+        ("test_tool", {}, {"timeout_ms": 7300000}, "Timeout must be between"),
+        # Invalid idempotency key
+        ("test_tool", {}, {"idempotency_key": ""}, "non-empty string"),
+    ],
+)
+async def test_input_validation(name, arguments, options, message):
+    """Test input validation for tool calls."""
+    mock_mcp = MockMCPSession(supports_mcp_tx=True)
+    mcp_tx_session = MCPTxSession(mock_mcp)
+    await mcp_tx_session.initialize()
 
-    with pytest.raises(ValueError, match="Timeout must be between"):
-        await mcp_tx_session.call_tool("test_tool", {}, timeout_ms=7300000)
+    with pytest.raises(ValueError, match=message):
+        await mcp_tx_session.call_tool(name, arguments, **options)
 
-    # Test invalid idempotency key
-    with pytest.raises(ValueError, match="non-empty string"):
-        await mcp_tx_session.call_tool("test_tool", {}, idempotency_key="")
+    assert mock_mcp.call_count == 0
 
 
 @pytest.mark.anyio
@@ -325,3 +535,281 @@ async def test_async_context_manager():
 
     # Session should be closed automatically
     mock_mcp.close.assert_called_once()
+
+
+def test_sanitize_error_message():
+    """Test that sensitive details are redacted from error messages."""
+    mcp_tx_session = MCPTxSession(MockMCPSession())
+
+    sanitized = mcp_tx_session._sanitize_error_message(
+        Exception("Auth failed: password=hunter2 token: abc123 in /home/alice/app via file:///etc/secrets")
+    )
+
+    assert "hunter2" not in sanitized
+    assert "abc123" not in sanitized
+    assert "alice" not in sanitized
+    assert "file://" not in sanitized
+    assert sanitized.count("[REDACTED]") == 4
+
+    # Long messages are truncated
+    assert len(mcp_tx_session._sanitize_error_message(Exception("x" * 500))) == 200
+
+
+@pytest.mark.anyio
+async def test_idempotency_cache_expiry():
+    """Test that cached results expire after the deduplication window."""
+    mock_mcp = MockMCPSession(supports_mcp_tx=True)
+    mcp_tx_session = MCPTxSession(mock_mcp, MCPTxConfig(deduplication_window_ms=10000))
+    await mcp_tx_session.initialize()
+
+    await mcp_tx_session.call_tool("test_tool", {}, idempotency_key="expiring-key")
+
+    # Age the cache entry past the deduplication window
+    cached_result, timestamp = mcp_tx_session._deduplication_cache["expiring-key"]
+    mcp_tx_session._deduplication_cache["expiring-key"] = (cached_result, timestamp - 11)
+
+    result = await mcp_tx_session.call_tool("test_tool", {}, idempotency_key="expiring-key")
+
+    assert result.mcp_tx_meta.duplicate is False
+    assert mock_mcp.call_count == 2
+
+
+def test_deduplication_cache_eviction():
+    """Test that the deduplication cache evicts expired and oldest entries."""
+    mcp_tx_session = MCPTxSession(MockMCPSession())
+    result = MCPTxResult(result=None, mcp_tx_meta=MCPTxResponse(ack=True, processed=True))
+
+    # Expired entries at the front are dropped on the next insert
+    mcp_tx_session._cache_result("stale", result)
+    cached, timestamp = mcp_tx_session._deduplication_cache["stale"]
+    mcp_tx_session._deduplication_cache["stale"] = (cached, timestamp - 3600)
+    mcp_tx_session._cache_result("fresh", result)
+    assert list(mcp_tx_session._deduplication_cache) == ["fresh"]
+
+    # Overflow removes the oldest entries first
+    for i in range(CACHE_MAX_SIZE):
+        mcp_tx_session._cache_result(f"key-{i}", result)
+    assert len(mcp_tx_session._deduplication_cache) == CACHE_MAX_SIZE + 1 - CACHE_CLEANUP_COUNT
+    assert "fresh" not in mcp_tx_session._deduplication_cache
+    assert f"key-{CACHE_MAX_SIZE - 1}" in mcp_tx_session._deduplication_cache
+
+
+def test_deduplication_cache_evicts_expired_on_lookup():
+    """Test that cache reads drop expired entries, not just the key being looked up."""
+    mcp_tx_session = MCPTxSession(MockMCPSession())
+    result = MCPTxResult(result=None, mcp_tx_meta=MCPTxResponse(ack=True, processed=True))
+
+    mcp_tx_session._cache_result("old-1", result)
+    mcp_tx_session._cache_result("old-2", result)
+    mcp_tx_session._cache_result("fresh", result)
+    for key in ("old-1", "old-2"):
+        cached, timestamp = mcp_tx_session._deduplication_cache[key]
+        mcp_tx_session._deduplication_cache[key] = (cached, timestamp - 3600)
+
+    assert mcp_tx_session._get_cached_result("unrelated") is None
+    assert list(mcp_tx_session._deduplication_cache) == ["fresh"]
+
+
+@pytest.mark.anyio
+async def test_retry_skipped_when_backoff_exceeds_total_timeout():
+    """Test that retries stop when the backoff cannot fit in total_timeout_ms."""
+    mock_mcp = MockMCPSession(should_fail=True, supports_mcp_tx=True)
+    mcp_tx_session = MCPTxSession(mock_mcp, MCPTxConfig(total_timeout_ms=1000))
+    await mcp_tx_session.initialize()
+
+    # The deadline is 1s away, but every backoff is at least 5s
+    retry_policy = RetryPolicy(max_attempts=3, base_delay_ms=5000, max_delay_ms=5000)
+
+    with anyio.fail_after(1):
+        result = await mcp_tx_session.call_tool("test_tool", {}, timeout_ms=100, retry_policy=retry_policy)
+
+    assert result.ack is False
+    assert result.final_status == "failed"
+    assert result.attempts == 1
+    assert mock_mcp.call_count == 1
+
+
+@pytest.mark.anyio
+async def test_attempt_timeout_clamped_to_total_timeout():
+    """Test that an attempt cannot run past total_timeout_ms, even with a longer timeout_ms."""
+    mock_mcp = MockMCPSession(supports_mcp_tx=True)
+
+    async def hanging_send_request(request):
+        await anyio.sleep(10)
+
+    mock_mcp.send_request = hanging_send_request
+    mcp_tx_session = MCPTxSession(mock_mcp, MCPTxConfig(total_timeout_ms=100))
+    await mcp_tx_session.initialize()
+
+    with anyio.fail_after(1):
+        result = await mcp_tx_session.call_tool("test_tool", {}, timeout_ms=5000)
+
+    assert result.ack is False
+    assert result.mcp_tx_meta.error_code == "MCP_TX_TIMEOUT"
+
+
+@pytest.mark.anyio
+async def test_retries_not_limited_by_attempt_timeout():
+    """Test that without total_timeout_ms every allowed attempt is made, however short the timeout."""
+    mock_mcp = MockMCPSession(should_fail=True, supports_mcp_tx=True)
+    mcp_tx_session = MCPTxSession(mock_mcp)
+    await mcp_tx_session.initialize()
+
+    # Backoffs of 100ms and 200ms together outlast three 100ms attempt timeouts
+    retry_policy = RetryPolicy(max_attempts=3, base_delay_ms=100, jitter=False)
+    result = await mcp_tx_session.call_tool("test_tool", {}, timeout_ms=100, retry_policy=retry_policy)
+
+    assert result.ack is True
+    assert result.attempts == 3
+    assert mock_mcp.call_count == 3
+
+
+def test_retry_delay_calculation():
+    """Test exponential backoff delays with and without jitter."""
+    mcp_tx_session = MCPTxSession(MockMCPSession())
+
+    policy = RetryPolicy(max_attempts=5, base_delay_ms=1000, max_delay_ms=5000, backoff_multiplier=2.0, jitter=False)
+    delays = [mcp_tx_session._calculate_retry_delay(attempt, policy) for attempt in range(5)]
+    assert delays == [1000, 2000, 4000, 5000, 5000]
+
+    jittered = RetryPolicy(max_attempts=3, base_delay_ms=1000, backoff_multiplier=2.0, jitter=True)
+    for _ in range(20):
+        assert 1600 <= mcp_tx_session._calculate_retry_delay(1, jittered) <= 2400
+        # Jitter never takes the delay below the base delay
+        assert mcp_tx_session._calculate_retry_delay(0, jittered) >= 1000
+
+
+def test_should_retry_classification():
+    """Test retryable error detection by error code, class name and message."""
+    mcp_tx_session = MCPTxSession(MockMCPSession())
+    policy = RetryPolicy(retryable_errors=["connection_error", "TransientError", "TEMPORARY_FAILURE"])
+
+    class TransientError(Exception):
+        pass
+
+    class UpstreamError(Exception):
+        error_code = "TEMPORARY_FAILURE"
+
+    assert mcp_tx_session._should_retry(TransientError("slow"), policy) is True
+    assert mcp_tx_session._should_retry(UpstreamError("try later"), policy) is True
+    assert mcp_tx_session._should_retry(Exception("upstream CONNECTION_ERROR"), policy) is True
+    assert mcp_tx_session._should_retry(ValueError("bad input"), policy) is False
+
+    # An empty list never matches, rather than matching every message
+    assert mcp_tx_session._should_retry(Exception("anything"), RetryPolicy(retryable_errors=[])) is False
+
+
+@pytest.mark.anyio
+async def test_transport_errors_wrapped_as_network_errors():
+    """Test that transport exceptions are classified as retryable network errors."""
+    mock_mcp = MockMCPSession(supports_mcp_tx=True)
+    mock_mcp.send_request = AsyncMock(side_effect=ConnectionResetError("peer went away"))
+    mcp_tx_session = MCPTxSession(mock_mcp)
+    await mcp_tx_session.initialize()
+
+    retry_policy = RetryPolicy(max_attempts=2, base_delay_ms=100, jitter=False)
+    result = await mcp_tx_session.call_tool("test_tool", {}, retry_policy=retry_policy)
+
+    assert result.ack is False
+    assert result.attempts == 2
+    assert result.mcp_tx_meta.error_code == "MCP_TX_NETWORK_ERROR"
+
+
+@pytest.mark.anyio
+async def test_non_transport_os_errors_not_wrapped():
+    """Test that OSErrors unrelated to the transport are neither wrapped nor retried."""
+    mock_mcp = MockMCPSession(supports_mcp_tx=True)
+    mock_mcp.send_request = AsyncMock(side_effect=PermissionError("access denied"))
+    mcp_tx_session = MCPTxSession(mock_mcp)
+    await mcp_tx_session.initialize()
+
+    retry_policy = RetryPolicy(max_attempts=3, base_delay_ms=100, jitter=False)
+    result = await mcp_tx_session.call_tool("test_tool", {}, retry_policy=retry_policy)
+
+    assert result.ack is False
+    assert result.attempts == 1
+    assert result.mcp_tx_meta.error_code != "MCP_TX_NETWORK_ERROR"
+    assert mock_mcp.send_request.await_count == 1
+
+
+@pytest.mark.anyio
+async def test_active_requests_view_and_snapshot():
+    """Test that active_requests is a live read-only view and snapshots are stable."""
+    mock_mcp = MockMCPSession(supports_mcp_tx=True)
+    started = anyio.Event()
+    release = anyio.Event()
+
+    async def blocking_send_request(request):
+        started.set()
+        await release.wait()
+        return {"result": "ok"}
+
+    mock_mcp.send_request = blocking_send_request
+    mcp_tx_session = MCPTxSession(mock_mcp)
+    await mcp_tx_session.initialize()
+
+    view = mcp_tx_session.active_requests
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(mcp_tx_session.call_tool, "test_tool", {})
+        await started.wait()
+
+        snapshot = mcp_tx_session.active_requests_snapshot()
+        assert len(view) == 1
+        assert snapshot.keys() == view.keys()
+        with pytest.raises(TypeError):
+            view["other"] = next(iter(snapshot.values()))  # type: ignore[index]
+
+        release.set()
+
+    assert len(view) == 0
+    assert len(snapshot) == 1
+
+
+@pytest.mark.anyio
+async def test_cache_stats():
+    """Test idempotency cache hit/miss accounting."""
+    mcp_tx_session = MCPTxSession(MockMCPSession(supports_mcp_tx=True))
+    await mcp_tx_session.initialize()
+
+    assert mcp_tx_session.cache_stats == {"hits": 0, "misses": 0, "hit_rate": 0.0, "size": 0}
+
+    await mcp_tx_session.call_tool("test_tool", {}, idempotency_key="stats-key")
+    await mcp_tx_session.call_tool("test_tool", {}, idempotency_key="stats-key")
+    await mcp_tx_session.call_tool("test_tool", {})  # No key, no cache lookup
+
+    assert mcp_tx_session.cache_stats == {"hits": 1, "misses": 1, "hit_rate": 0.5, "size": 1}
+
+
+@pytest.mark.anyio
+async def test_long_idempotency_keys_cached_by_digest():
+    """Test that long idempotency keys are stored as fixed-size digests but still deduplicate."""
+    mock_mcp = MockMCPSession(supports_mcp_tx=True)
+    mcp_tx_session = MCPTxSession(mock_mcp)
+    await mcp_tx_session.initialize()
+
+    long_key = "https://example.com/search?q=" + "x" * CACHE_KEY_DIGEST_THRESHOLD
+    await mcp_tx_session.call_tool("test_tool", {}, idempotency_key=long_key)
+    result = await mcp_tx_session.call_tool("test_tool", {}, idempotency_key=long_key)
+    await mcp_tx_session.call_tool("test_tool", {}, idempotency_key=long_key + "y")
+
+    assert result.mcp_tx_meta.duplicate is True
+    assert mock_mcp.call_count == 2
+    assert all(isinstance(key, bytes) and len(key) == 16 for key in mcp_tx_session._deduplication_cache)
+
+
+@pytest.mark.anyio
+async def test_initialize_advertises_capabilities():
+    """Test that initialize adds MCP-Tx capabilities without dropping caller capabilities."""
+    mock_mcp = MockMCPSession(supports_mcp_tx=True)
+    mock_mcp.initialize = AsyncMock(wraps=mock_mcp.initialize)
+    mcp_tx_session = MCPTxSession(mock_mcp)
+
+    await mcp_tx_session.initialize(capabilities={"experimental": {"other": {}}, "sampling": {}})
+
+    capabilities = mock_mcp.initialize.await_args.kwargs["capabilities"]
+    assert capabilities["sampling"] == {}
+    assert capabilities["experimental"]["other"] == {}
+    assert capabilities["experimental"]["mcp_tx"] == {
+        "version": "0.1.0",
+        "features": ("ack", "retry", "idempotency", "transactions"),
+    }
@@ -1,8 +1,10 @@
 """Test MCP-Tx types and data structures."""
 
+from dataclasses import FrozenInstanceError, fields, replace
 from datetime import datetime
 
 import pytest
+from pydantic import ValidationError
 
 from mcp_tx.types import (
     MCPTxConfig,
@@ -25,19 +27,35 @@ def test_mcp_tx_meta_creation():
     assert meta.timeout_ms == 5000
     assert meta.expect_ack is True
     assert meta.retry_count == 0
-    assert meta.request_id  # Should be generated
+    assert len(meta.request_id) == 32  # Should be generated (hex UUID)
 
-    # Test serialization
-    data = meta.to_dict()
-    assert "version" in data
-    assert "request_id" in data
-    assert "idempotency_key" in data
-    assert "timeout_ms" in data
+    # Test serialization; None values such as transaction_id are omitted
+    assert meta.to_dict() == {
+        "version": "0.1.0",
+        "request_id": meta.request_id,
+        "idempotency_key": "test-key",
+        "expect_ack": True,
+        "retry_count": 0,
+        "timeout_ms": 5000,
+        "timestamp": meta.timestamp,
+    }
+
+
+def test_to_dict_covers_all_fields():
+    """Test that to_dict field lists stay in sync with the dataclass fields."""
+    for cls in (MCPTxMeta, MCPTxResponse):
+        assert cls._FIELDS == tuple(f.name for f in fields(cls))
+
+
+@pytest.fixture(scope="module")
+def completed_response():
+    """A completed MCP-Tx response; frozen, so tests can share it safely."""
+    return MCPTxResponse(ack=True, processed=True, attempts=2, final_status="completed")
 
 
-def test_mcp_tx_response():
+def test_mcp_tx_response(completed_response):
     """Test MCPTxResponse creation."""
-    response = MCPTxResponse(ack=True, processed=True, attempts=2, final_status="completed")
+    response = completed_response
 
     assert response.ack is True
     assert response.processed is True
@@ -45,18 +63,25 @@ def test_mcp_tx_response():
     assert response.attempts == 2
     assert response.final_status == "completed"
 
+    # Responses and the results wrapping them are immutable
+    with pytest.raises(FrozenInstanceError):
+        response.duplicate = True  # type: ignore[misc]
+    with pytest.raises(FrozenInstanceError):
+        MCPTxResult(result=None, mcp_tx_meta=response).result = "changed"  # type: ignore[misc]
+
     # Test serialization
-    data = response.to_dict()
-    assert data["ack"] is True
-    assert data["processed"] is True
-    assert data["attempts"] == 2
+    assert response.to_dict() == {
+        "ack": True,
+        "processed": True,
+        "duplicate": False,
+        "attempts": 2,
+        "final_status": "completed",
+    }
 
 
-def test_mcp_tx_result():
+def test_mcp_tx_result(completed_response):
     """Test MCPTxResult wrapper."""
-    response_meta = MCPTxResponse(ack=True, processed=True, attempts=1, final_status="completed")
-
-    result = MCPTxResult(result={"data": "test"}, mcp_tx_meta=response_meta)
+    result = MCPTxResult(result={"data": "test"}, mcp_tx_meta=replace(completed_response, attempts=1))
 
     # Test convenience properties
     assert result.ack is True
@@ -86,12 +111,46 @@ def test_retry_policy_validation():
     assert policy.max_attempts == 5
     assert policy.base_delay_ms == 500
 
-    # Test validation (should raise on invalid values)
-    with pytest.raises(ValueError):
-        RetryPolicy(max_attempts=0)  # Too low
 
-    with pytest.raises(ValueError):
-        RetryPolicy(max_attempts=20)  # Too high
+@pytest.mark.parametrize(
+    ("field", "value", "error_type"),
+    [
+        ("max_attempts", 0, "greater_than_equal"),
+        ("max_attempts", 20, "less_than_equal"),
+        ("base_delay_ms", 50, "greater_than_equal"),
+        ("max_delay_ms", 500, "greater_than_equal"),
+        ("backoff_multiplier", 0.5, "greater_than_equal"),
+        ("backoff_multiplier", 11.0, "less_than_equal"),
+    ],
+)
+def test_retry_policy_rejects_out_of_range_values(field, value, error_type):
+    """Test that each RetryPolicy bound is enforced by its own validator."""
+    with pytest.raises(ValidationError) as exc_info:
+        RetryPolicy(**{field: value})
+
+    (error,) = exc_info.value.errors()
+    assert error["loc"] == (field,)
+    assert error["type"] == error_type
+
+
+def test_retry_policy_matches_follows_changes():
+    """Test that RetryPolicy.matches reflects retryable_errors after it is changed."""
+    policy = RetryPolicy()
+    assert policy.matches("timeout", "") is True
+    assert policy.matches(None, "upstream connection_error") is True
+    assert policy.matches("RATE_LIMITED", "slow down") is False
+
+    policy.retryable_errors.append("RATE_LIMITED")
+    assert policy.matches("RATE_LIMITED", "") is True
+
+    policy.retryable_errors = ["RATE_LIMITED"]
+    assert policy.matches("TIMEOUT", "timed out") is False
+
+    copied = policy.model_copy(update={"retryable_errors": ["TIMEOUT"]})
+    assert copied.matches("TIMEOUT", "") is True
+    assert copied.matches("RATE_LIMITED", "") is False
+
+    assert RetryPolicy(retryable_errors=[]).matches("TIMEOUT", "TIMEOUT") is False
 
 
 def test_mcp_tx_config_defaults():
@@ -102,19 +161,24 @@ def test_mcp_tx_config_defaults():
     assert config.default_timeout_ms == 30000
     assert config.max_concurrent_requests == 10
     assert config.deduplication_window_ms == 300000
+    assert config.close_timeout_ms == 5000
     assert config.enable_transactions is True
     assert config.enable_monitoring is True
-    assert isinstance(config.retry_policy, RetryPolicy)
+    assert type(config.retry_policy) is RetryPolicy
 
 
 def test_request_tracker():
     """Test RequestTracker functionality."""
+    # Fixed creation times keep the checks below independent of the clocks' resolution
+    created = datetime(2024, 1, 1)
     tracker = RequestTracker(
         request_id="test-123",
         transaction_id="tx-456",
         status=MessageStatus.PENDING,
-        created_at=datetime.utcnow(),
-        updated_at=datetime.utcnow(),
+        created_at=created,
+        updated_at=created,
+        created_ns=0,
+        updated_ns=0,
     )
 
     assert tracker.request_id == "test-123"
@@ -128,23 +192,35 @@ def test_request_tracker():
     assert tracker.status == MessageStatus.FAILED
     assert tracker.last_error == "Network error"
     assert tracker.updated_at > tracker.created_at
-
-
-def test_message_status_enum():
-    """Test MessageStatus enum values."""
-    assert MessageStatus.PENDING == "pending"
-    assert MessageStatus.SENT == "sent"
-    assert MessageStatus.ACKNOWLEDGED == "acknowledged"
-    assert MessageStatus.FAILED == "failed"
-    assert MessageStatus.TIMEOUT == "timeout"
-
-
-def test_transaction_status_enum():
-    """Test TransactionStatus enum values."""
-    assert TransactionStatus.INITIATED == "initiated"
-    assert TransactionStatus.IN_PROGRESS == "in_progress"
-    assert TransactionStatus.WAITING_ACK == "waiting_ack"
-    assert TransactionStatus.COMPLETED == "completed"
-    assert TransactionStatus.FAILED == "failed"
-    assert TransactionStatus.TIMEOUT == "timeout"
-    assert TransactionStatus.ROLLED_BACK == "rolled_back"
+    assert tracker.updated_ns > tracker.created_ns
+
+
+def test_per_request_types_use_slots():
+    """Test that the types allocated on every tool call carry no per-instance __dict__."""
+    for cls in (MCPTxMeta, MCPTxResponse, MCPTxResult, RequestTracker):
+        assert "__slots__" in vars(cls)
+        assert "__dict__" not in vars(cls)
+
+
+@pytest.mark.parametrize(
+    ("member", "value"),
+    [
+        (MessageStatus.PENDING, "pending"),
+        (MessageStatus.SENT, "sent"),
+        (MessageStatus.ACKNOWLEDGED, "acknowledged"),
+        (MessageStatus.FAILED, "failed"),
+        (MessageStatus.TIMEOUT, "timeout"),
+        (TransactionStatus.INITIATED, "initiated"),
+        (TransactionStatus.IN_PROGRESS, "in_progress"),
+        (TransactionStatus.WAITING_ACK, "waiting_ack"),
+        (TransactionStatus.COMPLETED, "completed"),
+        (TransactionStatus.FAILED, "failed"),
+        (TransactionStatus.TIMEOUT, "timeout"),
+        (TransactionStatus.ROLLED_BACK, "rolled_back"),
+    ],
+)
+def test_status_enum_values(member, value):
+    """Test MessageStatus and TransactionStatus wire values."""
+    assert member.value == value
+    # Lookup by value resolves to the very same member
+    assert type(member)(value) is member